@@ -1,94 +1,123 @@
 #!/usr/bin/env python3
 
-import argparse
+import collections
 import datetime
+import functools
+import itertools
 import os
 import subprocess
 import sys
 import time
-import textwrap
+import types
 import re
-import pprint
-import tabulate
+import shlex
 
 JOBFILE = "/tmp/message-jobs.txt"
+JOBFILE_ENCODING = "utf-8"
+JOBFILE_HEADER = "JobID | Scheduled date & time | Seconds offset | Prioritized | Message\n"
+
+_JOB_RE = re.compile(r"job (\d+)")
+_ID_RE = re.compile(r"\d+")
+
+BATCH_MARKER = "notifsystem-batch-job"
+_BATCH_MARKER_RE = re.compile(r"^" + BATCH_MARKER + r" \d+\n", re.MULTILINE)
+
+NowFields = collections.namedtuple('NowFields',
+                                   ['yyyymmdd', 'hhmmss', 'year', 'mmdd', 'dt'])
+
+
+def _fmt_iso(dt):
+    '''Format a datetime as "YYYY-MM-DD HH:MM:SS".'''
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} " \
+           f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+def _now_fields():
+    '''Capture the current date and time once, in the formats used when
+    scheduling.'''
+    dt = datetime.datetime.now()
+
+    return NowFields(f"{dt.year:04d}{dt.month:02d}{dt.day:02d}",
+                     f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}",
+                     dt.year,
+                     f"{dt.month:02d}{dt.day:02d}",
+                     dt)
+
+
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
 
 def valid_time(time_string):
     '''Validate that time is in HHMM or HHMMSS format.'''
-    if time_string is None:
+    if not time_string or not time_string.isascii() or \
+       not time_string.isdigit() or \
+       len(time_string) not in (4, 6):
         return False
 
-    if len(time_string) == 4:
-        try:
-            datetime.datetime.strptime(time_string, '%H%M')
-            return True
-        except ValueError:
-            pass
-
-    elif len(time_string) == 6:
-        try:
-            datetime.datetime.strptime(time_string, '%H%M%S')
-            return True
-        except ValueError:
-            pass
+    hours, minutes = int(time_string[:2]), int(time_string[2:4])
+    seconds = int(time_string[4:6]) if len(time_string) == 6 else 0
 
-    return False
+    return hours < 24 and minutes < 60 and seconds < 60
 
 
 def valid_date(date_string):
     '''Validate that date is in YYYYMMDD or MMDD format.'''
-    if date_string is None:
+    if not date_string or not date_string.isascii() or \
+       not date_string.isdigit() or \
+       len(date_string) not in (4, 8):
         return False
 
-    if len(date_string) == 8:
-        try:
-            datetime.datetime.strptime(date_string, '%Y%m%d')
-            return True
-        except ValueError:
-            pass
+    # A bare MMDD is checked against a non-leap year, like strptime does
+    year = int(date_string[:-4]) if len(date_string) == 8 else 1900
+    month, day = int(date_string[-4:-2]), int(date_string[-2:])
 
-    elif len(date_string) == 4:
-        try:
-            datetime.datetime.strptime(date_string, '%m%d')
-            return True
-        except ValueError:
-            pass
+    if year < 1 or not 1 <= month <= 12:
+        return False
 
-    return False
+    month_days = _MONTH_DAYS[month - 1]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        month_days = 29
 
+    return 1 <= day <= month_days
 
-def past_date(date_string):
+
+def past_date(date_string, now):
     '''Check whether the date is in the past'''
     if len(date_string) == 4:
         return False
 
-    current_date = datetime.datetime.today().strftime('%Y%m%d')
+    current_date = now.yyyymmdd
 
     if date_string <= current_date:
         return True
 
 
-def check_add(args, parser):
+def print_help(parser):
+    '''Print usage, building the parser if the fast path skipped it.'''
+    (parser or build_parser()).print_help()
+
+
+def check_add(args, parser, now):
     '''Check arguments if we are adding a notification.'''
     mode = args.add_mode
 
     if (mode == "at" or mode == "in") and not valid_time(args.time):
         print("Invalid or missing time specification!")
-        parser.print_help()
+        print_help(parser)
         sys.exit()
 
     elif mode == "on" and not valid_date(args.time):
         print("Invalid or missing date specification!")
-        parser.print_help()
+        print_help(parser)
         sys.exit()
 
-    elif mode == "on" and past_date(args.time):
+    elif mode == "on" and past_date(args.time, now):
         print("The date should be a future date!")
         sys.exit()
 
     if args.message is None:
         print("Missing message specification!")
-        parser.print_help()
+        print_help(parser)
         sys.exit()
 
 
@@ -106,18 +135,21 @@ def check_list_del(args, parser):
         sys.exit()
 
 
-def check_arguments(args, parser):
+def check_arguments(args, parser, now):
     '''Check that the supplied arguments fit the specified operation.'''
     op = args.operation
 
     if op == "add":
-        check_add(args, parser)
+        check_add(args, parser, now)
     elif op == "list" or op == "del":
         check_list_del(args, parser)
 
 
-def parse_arguments():
-    '''Parse arguments passed by the user.'''
+def build_parser():
+    '''Build the argparse parser for the command line.'''
+    import argparse
+    import textwrap
+
     parser = argparse.ArgumentParser(description="A Linux notification \
 scheduler.", formatter_class=argparse.RawTextHelpFormatter)
 
@@ -142,6 +174,13 @@ alphabetically instead of soonest first (the default is soonest first)",
                         action="store_true", default=False)
     parser.add_argument("-id", help="ID of the notification to cancel")
 
+    return parser
+
+
+def parse_arguments():
+    '''Parse arguments passed by the user.'''
+    parser = build_parser()
+
     if len(sys.argv) == 1:
         parser.print_help()
         parser.exit()
@@ -151,6 +190,69 @@ alphabetically instead of soonest first (the default is soonest first)",
     return args, parser
 
 
+# Option -> (attribute, kind, choices) for parse_arguments_fast
+FAST_OPTIONS = {
+    "-o": ("operation", "choice", ("add", "list", "del")),
+    "--operation": ("operation", "choice", ("add", "list", "del")),
+    "-am": ("add_mode", "choice", ("at", "in", "on")),
+    "--add-mode": ("add_mode", "choice", ("at", "in", "on")),
+    "-t": ("time", "value", None),
+    "--time": ("time", "value", None),
+    "-s": ("sound", "flag", None),
+    "--sound": ("sound", "flag", None),
+    "-p": ("prioritize", "flag", None),
+    "--prioritize": ("prioritize", "flag", None),
+    "-u": ("uptime", "int", None),
+    "--uptime": ("uptime", "int", None),
+    "-m": ("message", "value", None),
+    "--message": ("message", "value", None),
+    "-a": ("alphabetical", "flag", None),
+    "--alphabetical": ("alphabetical", "flag", None),
+    "-id": ("id", "value", None),
+}
+
+
+def parse_arguments_fast(argv):
+    '''Parse the common, well-formed command lines without argparse.
+
+    Returns None for anything unusual (help, unknown or abbreviated options,
+    bad values), in which case parse_arguments() should be used instead.'''
+    if not argv:
+        return None
+
+    values = {"operation": "add", "add_mode": "at", "time": None,
+              "sound": False, "prioritize": False, "uptime": 0,
+              "message": None, "alphabetical": False, "id": None}
+
+    i = 0
+    while i < len(argv):
+        option = FAST_OPTIONS.get(argv[i])
+        if option is None:
+            return None
+
+        name, kind, choices = option
+        if kind == "flag":
+            values[name] = True
+            i += 1
+            continue
+
+        if i + 1 == len(argv) or argv[i + 1].startswith("-"):
+            return None
+        value = argv[i + 1]
+
+        if kind == "choice" and value not in choices:
+            return None
+        if kind == "int":
+            if not value.isascii() or not value.isdigit():
+                return None
+            value = int(value)
+
+        values[name] = value
+        i += 2
+
+    return types.SimpleNamespace(**values)
+
+
 def parse_time_to_seconds(time_string):
     '''Parse HHMMSS or HHMM into seconds'''
     if len(time_string) == 4:
@@ -163,81 +265,85 @@ def parse_time_to_seconds(time_string):
     return hours + minutes + seconds
 
 
-def change_if_targeting_current_minute(at_time, seconds_offset):
+def change_if_targeting_current_minute(at_time, seconds_offset, now):
     '''Take care of the special case when the notification is scheduled in the
     same minute, for example now is 120030, and target time is 120050'''
-    time_string_now = datetime.datetime.today().strftime('%H%M%S')
-
-    if at_time + str(seconds_offset) > time_string_now and \
-            at_time == time_string_now[:4]:
-        seconds_offset_from_now = str(int(seconds_offset) - int(time_string_now[4:]))
-        return 'now', seconds_offset_from_now
+    if at_time == now.hhmmss[:4] and seconds_offset > now.dt.second:
+        return 'now', seconds_offset - now.dt.second
 
     return at_time, seconds_offset
 
 
-def prepend_year(time_string):
-    mmdd_now = datetime.datetime.today().strftime('%m%d')
-    yyyy_now = datetime.datetime.today().strftime('%Y')
-    yyyy_next = str(int(yyyy_now) + 1)
+def prepend_year(time_string, now):
+    '''Prepend the year of the next occurrence of mmddHHMM, which is next
+    year if that date is today or already past.'''
+    year = now.year + 1 if now.mmdd >= time_string[:4] else now.year
 
-    if mmdd_now >= time_string[:4]:
-        return yyyy_next + time_string
+    return f"{year:04d}{time_string}"
 
 
-def at_time_and_seconds_offset(time_string):
+def at_time_and_seconds_offset(time_string, now):
     # If time_string is mmddHHMM, prepend year
     if len(time_string) == 8:
-        prepend_year(time_string)
+        time_string = prepend_year(time_string, now)
 
     # If time_string is yyyymmddHHMM, just prepend '-t' option for 'at' command
     if len(time_string) == 12:
-        return " -t " + time_string, "00"
+        return " -t " + time_string, 0
 
     # If time_string is HHMM, just return with zero offset
     if len(time_string) == 4:
-        return time_string, "00"
+        return time_string, 0
 
     # If time_string is HHMMSS, handle scheduling for the same minute
-    return change_if_targeting_current_minute(time_string[:4], time_string[4:])
+    return change_if_targeting_current_minute(time_string[:4],
+                                              int(time_string[4:]), now)
 
 
-def command_to_execute(at_time, seconds_offset, message, uptime, sound_command):
-    return ("echo " +  # We will use echo to feed the job to the at command
-           "'export DISPLAY=:0 && " +  # Needed for notification to show up
-           "sleep " + seconds_offset + " && "  # at works only with minutes
-           "notify-send " +  # Beginning of the notification command
-           "-t " + str(uptime * 1000) +  # How soon the notification disappears
-           ' "' + message + '"' +  # The message the notification will have
-           sound_command +  # The playing of the sound if opted
-           "' | at " + at_time)  # Piping the job to at
+def command_to_execute(seconds_offset, message, uptime, sound_command):
+    return ("export DISPLAY=:0 && "  # Needed for notification to show up
+            f"sleep {seconds_offset} && "  # at works only with minutes
+            # How soon the notification disappears and what it says
+            f"notify-send -t {uptime * 1000} {shlex.quote(message)}"
+            f"{sound_command}")  # The playing of the sound if opted
 
 
-def write_job_to_file(jobID, scheduled_time, seconds_offset, prioritize, message):
-    header = None
+def job_line(jobID, scheduled_time, seconds_offset, prioritize, message):
+    return jobID + " | " + scheduled_time + " | " + \
+           str(seconds_offset) + " | " + \
+           ("Yes" if prioritize else "No") + " | " + \
+           message + "\n"
 
-    if not os.path.exists(JOBFILE):
-        header = "JobID | Scheduled date & time | Seconds offset | Prioritized | Message\n"
 
-    job_line = jobID + " | " + scheduled_time + " | " + \
-               str(seconds_offset) + " | " + \
-               ("Yes" if prioritize else "No") + " | " + \
-               message + "\n"
+def write_jobs_to_file(records, flush_durable=False):
+    '''Append (jobID, scheduled_time, seconds_offset, prioritize, message)
+    records to the job file in a single write.
+
+    The job file is only a scratch index of what was scheduled, so by default
+    it is not synced to disk. With flush_durable the whole batch is synced
+    with one fsync after the write, rather than one per record.'''
+    blob = "".join([job_line(*record) for record in records])
 
-    with open(JOBFILE, 'a') as jobfile:
-        if header:
-            jobfile.writelines(header)
-        jobfile.writelines(job_line)
+    fd = os.open(JOBFILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        # An empty file has just been created and needs the header first
+        if os.fstat(fd).st_size == 0:
+            blob = JOBFILE_HEADER + blob
+        os.write(fd, blob.encode(JOBFILE_ENCODING, "surrogateescape"))
+        if flush_durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
-def get_scheduled_time(time_string, seconds_offset):
-    time_now = datetime.datetime.now()
-    HH_now = str(time_now.hour).zfill(2)
-    MM_now = str(time_now.minute).zfill(2)
+def get_scheduled_time(time_string, seconds_offset, now):
+    time_now = now.dt
+    HH_now = f"{time_now.hour:02d}"
+    MM_now = f"{time_now.minute:02d}"
 
     if time_string[:4] == " -t ":
         datetime_object = datetime.datetime.strptime(time_string, ' -t %Y%m%d%H%M%S')
-        return datetime_object.strftime('%Y-%m-%d %H:%M:%S')
+        return _fmt_iso(datetime_object)
 
     datetime_object = time_now
     if time_string < HH_now + MM_now:
@@ -245,93 +351,214 @@ def get_scheduled_time(time_string, seconds_offset):
     if time_string != "now":
         datetime_object = datetime_object.replace(hour=int(time_string[:2]))
         datetime_object = datetime_object.replace(minute=int(time_string[2:4]))
-    datetime_object = datetime_object.replace(second=int(seconds_offset))
+    datetime_object = datetime_object.replace(second=seconds_offset)
 
-    return datetime_object.strftime('%Y-%m-%d %H:%M:%S')
+    return _fmt_iso(datetime_object)
 
 
-def add_at(time_string, sound, prioritize, uptime, message):
-    '''Schedule a notification using the "at time X" specification.'''
-    at_time, seconds_offset = at_time_and_seconds_offset(time_string)
+def at_job(time_string, sound, uptime, message, now):
+    '''Build the job that at runs to show a notification.'''
+    at_time, seconds_offset = at_time_and_seconds_offset(time_string, now)
 
     sound_command = " && mplayer ~/bin/bell.mp3" if sound else ""
 
-    command = command_to_execute(at_time, seconds_offset, message, uptime,
+    command = command_to_execute(seconds_offset, message, uptime,
             sound_command)
 
+    return at_time, seconds_offset, command
 
-    output = subprocess.run(command, shell=True, capture_output=True,
-            text=True).stderr
 
-    jobID = re.search("job [0-9]+", output).group()[4:]
-    scheduled_time = get_scheduled_time(at_time, seconds_offset)
-    write_job_to_file(jobID, scheduled_time, seconds_offset, prioritize, message)
+def add_at(time_string, sound, prioritize, uptime, message, now):
+    '''Schedule a notification using the "at time X" specification.'''
+    at_time, seconds_offset, command = at_job(time_string, sound, uptime,
+            message, now)
+
+    # The job is fed to at on stdin, at_time may be e.g. " -t YYYYmmddHHMM"
+    # surrogateescape hands a message from argv back to at as its raw bytes
+    output = subprocess.run(["at"] + at_time.split(), input=command,
+            capture_output=True, text=True, errors="surrogateescape").stderr
+
+    jobID = _JOB_RE.search(output).group(1)
+    scheduled_time = get_scheduled_time(at_time, seconds_offset, now)
+
+    return jobID, scheduled_time, seconds_offset, prioritize, message
 
 
 def add_delta(time_string):
     time_delta = parse_time_to_seconds(time_string)
     current_time_from_epoch = int(time.time())
     target_time_from_epoch = current_time_from_epoch + time_delta
-    target_time = time.strftime('%H%M%S',
-                                time.localtime(target_time_from_epoch))
+    target = time.localtime(target_time_from_epoch)
+    target_time = f"{target.tm_hour:02d}{target.tm_min:02d}{target.tm_sec:02d}"
 
     return target_time
 
 
-def add_in(time_string, sound, prioritize, uptime, message):
+def add_in(time_string, sound, prioritize, uptime, message, now):
     '''Schedule a notification using the "time X from now" specification.'''
     target_time = add_delta(time_string)
-    add_at(target_time, sound, prioritize, uptime, message)
+    return add_at(target_time, sound, prioritize, uptime, message, now)
 
 
-def add_on(date_string, sound, prioritize, uptime, message):
+def add_on(date_string, sound, prioritize, uptime, message, now):
     '''Schedule a notification using the "on (day) X" specification.'''
     target_time = date_string + "0000"
-    add_at(target_time, sound, prioritize, uptime, message)
+    return add_at(target_time, sound, prioritize, uptime, message, now)
 
 
-def add_notification(mode, time_string, sound, prioritize, uptime, message):
+def add_notification(mode, time_string, sound, prioritize, uptime, message,
+                     now):
     '''Schedule a notification.'''
     if mode == "at":
-        add_at(time_string, sound, prioritize, uptime, message)
+        record = add_at(time_string, sound, prioritize, uptime, message,
+                now)
     elif mode == "in":
-        add_in(time_string, sound, prioritize, uptime, message)
+        record = add_in(time_string, sound, prioritize, uptime, message,
+                now)
     else:
-        add_on(time_string, sound, prioritize, uptime, message)
+        record = add_on(time_string, sound, prioritize, uptime, message,
+                now)
+
+    write_jobs_to_file([record])
+
+
+def target_time_string(mode, time_string):
+    '''Convert a time specification of any mode into an "at" time.'''
+    if mode == "in":
+        return add_delta(time_string)
+    elif mode == "on":
+        return time_string + "0000"
+
+    return time_string
+
+
+def check_batch_job(mode, time_string, message, now):
+    '''Raise ValueError if a batch job specification is not valid.'''
+    if mode not in ("at", "in", "on"):
+        raise ValueError("Invalid scheduling mode: " + repr(mode))
+
+    if mode != "on" and not valid_time(time_string):
+        raise ValueError("Invalid time specification: " + repr(time_string))
+
+    if mode == "on" and not valid_date(time_string):
+        raise ValueError("Invalid date specification: " + repr(time_string))
+
+    if mode == "on" and past_date(time_string, now):
+        raise ValueError("The date should be a future date: " + time_string)
+
+    if message is None:
+        raise ValueError("Missing message specification!")
+
+
+def add_notifications_batch(jobs, flush_durable=False):
+    '''Schedule several notifications given as (mode, time_string, sound,
+    prioritize, uptime, message) tuples using a single shell invocation.
+    See write_jobs_to_file() for flush_durable.
+
+    All jobs are validated before anything is scheduled. Jobs that at
+    rejects are reported with a RuntimeError after the others are recorded.'''
+    if not jobs:
+        return
+
+    now = _now_fields()
+
+    for mode, time_string, sound, prioritize, uptime, message in jobs:
+        check_batch_job(mode, time_string, message, now)
+
+    scheduled = []
+    commands = []
+
+    for index, (mode, time_string, sound, prioritize, uptime, message) in \
+            enumerate(jobs):
+        at_time, seconds_offset, command = at_job(
+                target_time_string(mode, time_string), sound, uptime, message,
+                now)
+        scheduled_time = get_scheduled_time(at_time, seconds_offset, now)
+        scheduled.append((scheduled_time, seconds_offset, prioritize, message))
+        # The marker ties the output of at that follows it to this job
+        commands.append(f"echo '{BATCH_MARKER} {index}' >&2")
+        # printf, unlike echo in some shells, leaves backslashes alone
+        commands.append("printf '%s\\n' " + shlex.quote(command) +
+                        " | at " + at_time)
+
+    # surrogateescape hands messages from argv to the shell as their raw bytes
+    output = subprocess.run(["/bin/sh", "-c", "\n".join(commands)],
+            capture_output=True, text=True, errors="surrogateescape").stderr
+
+    job_outputs = _BATCH_MARKER_RE.split(output)[1:]
+
+    records = []
+    failed = []
+    for job_output, (scheduled_time, seconds_offset, prioritize, message) in \
+            zip(job_outputs, scheduled):
+        match = _JOB_RE.search(job_output)
+        if match is None:
+            failed.append(message)
+            continue
+        records.append((match.group(1), scheduled_time, seconds_offset,
+                        prioritize, message))
+
+    write_jobs_to_file(records, flush_durable)
+
+    if failed:
+        raise RuntimeError("Could not schedule notifications: " +
+                           ", ".join(map(repr, failed)))
 
 
 def pending_jobIDs():
-    atq_output = subprocess.run('atq', shell=True, capture_output=True,
+    atq_output = subprocess.run(['atq'], capture_output=True,
             text=True).stdout
 
     job_lines = atq_output.splitlines()
 
-    return list(map(lambda line: line.split('\t')[0], job_lines))
+    return [line.partition('\t')[0] for line in job_lines]
 
 
-def job_entries():
-    with open(JOBFILE) as jobfile:
-        job_entries = jobfile.readlines()[1:]
-    return job_entries
+def _iter_jobs():
+    '''Yield the job lines of the job file, skipping the header.'''
+    if not os.path.exists(JOBFILE):
+        return
+
+    with open(JOBFILE, encoding=JOBFILE_ENCODING,
+              errors="surrogateescape") as jobfile:
+        next(jobfile, None)
+        yield from jobfile
 
 
 def get_time_left(date_time_obj):
     delta = date_time_obj - datetime.datetime.today()
-    time_left = str(delta).split('.', 2)[0]
-
-    if len(time_left) == 7:
-        time_left = '0' + time_left
+    hours, rest = divmod(delta.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+
+    # Same layout as str(timedelta) without microseconds, hours padded
+    # unless there is a day count in front
+    if delta.days:
+        time_left = f"{delta.days} day{'s' if abs(delta.days) != 1 else ''}, " \
+                    f"{hours}:{minutes:02d}:{seconds:02d}"
+    else:
+        time_left = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
     time_left_seconds = str(delta.seconds)
 
     return time_left, time_left_seconds
 
 
-def job_line_into_output_fields(job):
-    fields = job.split(" | ")
+@functools.lru_cache(maxsize=1024)
+def parse_job_time(job_time):
+    '''Parse a "YYYY-MM-DD HH:MM:SS" timestamp from the job file.'''
+    return datetime.datetime(int(job_time[0:4]), int(job_time[5:7]),
+                             int(job_time[8:10]), int(job_time[11:13]),
+                             int(job_time[14:16]), int(job_time[17:19]))
+
 
-    jobID, job_time, seconds_offset, prioritize, job_message = fields[0], fields[1], fields[2], fields[3], "".join(fields[4:]).rstrip()
+def job_line_into_output_fields(job):
+    # The message is last, so any " | " inside it is left untouched
+    jobID, _, rest = job.partition(" | ")
+    job_time, _, rest = rest.partition(" | ")
+    seconds_offset, _, rest = rest.partition(" | ")
+    prioritize, _, job_message = rest.partition(" | ")
+    job_message = job_message.rstrip()
 
-    date_time_obj = datetime.datetime.strptime(job_time, '%Y-%m-%d %H:%M:%S')
+    date_time_obj = parse_job_time(job_time)
 
     time_when = str(date_time_obj)
 
@@ -345,57 +572,101 @@ def job_rows_to_table():
 
 
 def get_job_ID(job_line):
-    return re.search("[0-9]+", job_line).group()
+    return _ID_RE.search(job_line).group()
 
 
 def get_jobs_to_list():
-    active_IDs = pending_jobIDs()
-    jobs_in_file = job_entries()
-    jobs_to_list = []
+    jobs = _iter_jobs()
 
-    for job_line in jobs_in_file:
-        jobID = get_job_ID(job_line)
-        if jobID in active_IDs:
-            jobs_to_list.append(job_line)
+    # Without any recorded jobs there is no need to ask atq
+    first_job = next(jobs, None)
+    if first_job is None:
+        return []
 
-    return jobs_to_list
+    active_IDs = frozenset(pending_jobIDs())
+
+    return [job_line for job_line in itertools.chain([first_job], jobs)
+            if get_job_ID(job_line) in active_IDs]
 
 
 def get_notification_entries(alphabetical):
     '''Get list of pending notifications with data to be listed.'''
     jobs_to_list = get_jobs_to_list()
-    job_entries = list(map(job_line_into_output_fields, jobs_to_list))
+    job_entries = [job_line_into_output_fields(job) for job in jobs_to_list]
 
+    # Prioritized notifications first, then by message or soonest first; the
+    # "YYYY-MM-DD HH:MM:SS" scheduled time sorts chronologically as a string
     if alphabetical:
-        job_entries.sort(key=lambda job: job[5])
+        job_entries.sort(key=lambda job: (job[4] != "Yes", job[5]))
     else:
-        job_entries.sort(key=lambda job: job[3])
+        job_entries.sort(key=lambda job: (job[4] != "Yes", job[1]))
+
+    return job_entries
 
-    job_entries.sort(key=lambda job: job[4], reverse=True)
 
-    for entry in job_entries:
-        entry = entry[:4] + entry[5:]
+def render_table(rows, headers):
+    '''Render rows of strings in the same layout as tabulate's default
+    "simple" format with number parsing disabled for the message column,
+    without tabulate's per-cell type detection.'''
+    # tabulate measures display width with wcwidth when it is installed
+    try:
+        from wcwidth import wcswidth as display_width
+    except ImportError:
+        display_width = len
 
-    return job_entries
+    # tabulate strips surrounding whitespace from every cell
+    rows = [[cell.strip() for cell in row] for row in rows]
+    columns = list(zip(headers, *rows))
+    # tabulate keeps headers at least two characters narrower than a column
+    widths = [max(display_width(column[0]) + 2,
+                  *map(display_width, column[1:]))
+              for column in columns]
+    # Only the ID and seconds columns are numeric, those are right-aligned
+    numeric = [all(cell.isascii() and cell.isdigit() for cell in column[1:])
+               for column in columns[:-1]] + [False]
+
+    def pad(cell, width, right):
+        padding = " " * (width - display_width(cell))
+        return padding + cell if right else cell + padding
+
+    def render_row(row):
+        cells = [pad(cell, width, right)
+                 for cell, width, right in zip(row, widths, numeric)]
+        return "  ".join(cells).rstrip()
+
+    lines = [render_row(headers),
+             "  ".join(["-" * width for width in widths])]
+    lines.extend([render_row(row) for row in rows])
+
+    return "\n".join(lines)
 
 
 def list_notifications(alphabetical):
     '''List pending notifications.'''
     notification_entries = get_notification_entries(alphabetical)
 
-    table = tabulate.tabulate(notification_entries, headers=['JobID',
-        'Scheduled date & time', 'Time left',
-        'Time left in seconds', 'Prioritized', 'Message'])
+    if not notification_entries:
+        print("No scheduled notifications.")
+        return
+
+    headers = ['JobID', 'Scheduled date & time', 'Time left',
+               'Time left in seconds', 'Prioritized', 'Message']
 
-    if notification_entries:
-        print(table)
+    # tabulate gets slow on long lists, where a plain renderer is used
+    if len(notification_entries) < 32:
+        import tabulate
+        # Messages are shown as written, e.g. "1e5" is not turned into 100000
+        table = tabulate.tabulate(notification_entries, headers=headers,
+                                  disable_numparse=[5])
     else:
-        print("No scheduled notifications.")
+        table = render_table(notification_entries, headers)
+
+    print(table)
 
 
 def delete_notification(jobID):
     '''Delete a notification.'''
-    output = subprocess.run("atrm " + jobID, shell=True, capture_output=True,
+    output = subprocess.run(["atrm", jobID], capture_output=True,
             text=True).stderr
     if "Cannot find jobid" in output:
         print("Notification does not exist.")
@@ -403,12 +674,12 @@ def delete_notification(jobID):
         print("Notification with ID " + jobID + " deleted.")
 
 
-def dispatch(args):
+def dispatch(args, now):
     '''Dispatch based on whether the user wants to add a notification,
     list notifications, or cancel a notification.'''
     if args.operation == "add":
         add_notification(args.add_mode, args.time, args.sound, args.prioritize,
-                         args.uptime, args.message)
+                         args.uptime, args.message, now)
     elif args.operation == "list":
         list_notifications(args.alphabetical)
     elif args.operation == "del":
@@ -416,6 +687,9 @@ def dispatch(args):
 
 
 if __name__ == "__main__":
-    args, parser = parse_arguments()
-    check_arguments(args, parser)
-    dispatch(args)
+    args, parser = parse_arguments_fast(sys.argv[1:]), None
+    if args is None:
+        args, parser = parse_arguments()
+    now = _now_fields()
+    check_arguments(args, parser, now)
+    dispatch(args, now)